@@ -3,24 +3,46 @@ from __future__ import annotations
 
 import asyncio
 import logging
-from typing import Any, Dict, Final
+from dataclasses import dataclass
+from time import monotonic
+from typing import Any, Dict, Final, Iterable, List, Set
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.core import HomeAssistant, ServiceCall, callback
 from homeassistant.helpers.discovery import async_load_platform
+from homeassistant.helpers.dispatcher import async_dispatcher_send
 from homeassistant.helpers.typing import ConfigType
 
-from .const import DOMAIN, LANG
+from .const import DOMAIN, LANG, SCAN_INTERVAL_MAX_FACTOR, SIGNAL_NEW_DEVICES
 from .device_manager import DeviceManager
 from .tcp_client import CozyLifeDevice
 from .udp_discover import get_ip, scan_subnet_async
-from .utils import get_pid_list
+from .utils import async_get_pid_list
 
 _LOGGER = logging.getLogger(__name__)
 
 PLATFORMS: Final = [Platform.LIGHT, Platform.SWITCH]
 SCAN_INTERVAL_CONFIG_KEY = "scan_interval"
+SCAN_INTERVAL_MAX_CONFIG_KEY = "scan_interval_max"
+SERVICE_RESCAN: Final = "rescan"
+# Upper bound on simultaneous TCP connects so large IP lists don't exhaust sockets
+MAX_CONCURRENT_CONNECTS: Final = 32
+# UDP discovery results are reused for this long (must stay below the minimum scan_interval)
+IP_CACHE_TTL: Final = 30
+IP_CACHE_KEY: Final = "_ip_cache"
+# On scans that find no IP changes, only recheck availability every N-th cycle
+AVAILABILITY_CHECK_CYCLES: Final = 2
+# A device IP must be missing from this many consecutive scans before it is dropped
+MISSED_SCANS_BEFORE_GONE: Final = 2
+
+
+@dataclass
+class _IpDiscoveryCache:
+    """UDP discovery result with its expiry time."""
+
+    expires_at: float
+    ips: List[str]
 
 
 async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
@@ -56,80 +78,85 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     # Get configuration
     lang = entry.data.get("lang", LANG)
-    ip_list_config = entry.data.get("ip", [])
-    subnets_config = entry.data.get("subnets", [])
     scan_interval = entry.options.get(SCAN_INTERVAL_CONFIG_KEY, 300)
+    scan_interval_max = entry.options.get(
+        SCAN_INTERVAL_MAX_CONFIG_KEY, scan_interval * SCAN_INTERVAL_MAX_FACTOR
+    )
 
     # Initialize PID list
     try:
-        await hass.async_add_executor_job(get_pid_list, lang)
+        await async_get_pid_list(lang)
     except Exception as e:
         _LOGGER.error(f"Failed to load PID list: {e}")
 
-    # Discover devices via UDP broadcast
-    discovered_ips = await hass.async_add_executor_job(get_ip)
-    _LOGGER.info(f"UDP discovery found {len(discovered_ips)} device(s): {discovered_ips}")
-
-    # Scan user-configured subnets (for cross-subnet discovery)
-    subnet_ips = []
-    if subnets_config:
-        _LOGGER.info(f"Scanning {len(subnets_config)} subnet(s) for cross-subnet devices: {subnets_config}")
-        for subnet in subnets_config:
-            try:
-                ips = await scan_subnet_async(subnet, timeout=1.0)
-                subnet_ips.extend(ips)
-            except Exception as e:
-                _LOGGER.error(f"Error scanning subnet {subnet}: {e}")
-
-    # Combine discovered IPs from all sources
-    all_ips = list(set(discovered_ips + ip_list_config + subnet_ips))
-
-    if not all_ips:
-        _LOGGER.warning("No devices discovered or configured")
-        hass.data[DOMAIN][entry.entry_id] = {
-            "device_manager": device_manager,
-            "tcp_clients": [],
-            "scan_task": None,
-        }
-        return True
-
-    _LOGGER.info(f"Found {len(all_ips)} devices: {all_ips}")
-
-    # Connect to all devices
-    tcp_clients = []
-    for ip in all_ips:
-        device = CozyLifeDevice(ip)
-        try:
-            if await device.async_connect():
-                tcp_clients.append(device)
-                device_manager.add_device(device)
-                device_manager.register_device(device)
-                _LOGGER.info(f"Successfully connected to device at {ip}")
-            else:
-                _LOGGER.warning(f"Failed to connect to device at {ip}")
-        except Exception as e:
-            _LOGGER.error(f"Error connecting to {ip}: {e}")
+    # Start discovery and reconnect to previously known devices meanwhile
+    initial_discovery = asyncio.create_task(
+        _async_discover_all_ips(
+            hass, entry.data.get("ip", []), entry.data.get("subnets", [])
+        )
+    )
+    tcp_clients = await _async_connect_devices(device_manager.known_ips)
+    device_manager.register_devices_bulk(tcp_clients)
 
-    if not tcp_clients:
-        _LOGGER.warning("No devices connected initially - will discover via periodic scan")
+    if tcp_clients:
+        _LOGGER.info(f"Reconnected to {len(tcp_clients)} known device(s)")
+    else:
+        _LOGGER.warning("No known devices connected - waiting for discovery")
 
     # Store data
     hass.data[DOMAIN][entry.entry_id] = {
         "device_manager": device_manager,
         "tcp_clients": tcp_clients,
         "scan_interval": scan_interval,
-        "last_scan_ips": set(all_ips),
+        "last_scan_ips": {device.ip for device in tcp_clients},
+        "rescan_event": asyncio.Event(),
+        "platforms_loaded": False,
+        "initial_discovery": initial_discovery,
     }
 
-    # Setup platforms - even if no devices connected yet
-    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
-
-    # Start periodic discovery and reconnection
+    # Known devices get their entities right away; devices found by the
+    # initial discovery are added by the discovery task via SIGNAL_NEW_DEVICES
+    # (or a late platform forward when there were no known devices)
+    if tcp_clients:
+        hass.data[DOMAIN][entry.entry_id]["platforms_loaded"] = True
+        try:
+            await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+        except Exception:
+            # Setup failed: don't leave discovery or open connections behind
+            await _async_cancel_task(initial_discovery)
+            await asyncio.gather(
+                *(device.async_disconnect() for device in tcp_clients),
+                return_exceptions=True,
+            )
+            hass.data[DOMAIN].pop(entry.entry_id, None)
+            raise
+
+    # Start periodic discovery and reconnection, beginning with the initial scan
     scan_task = asyncio.create_task(
-        _async_periodic_discovery(hass, entry, device_manager, scan_interval)
+        _async_periodic_discovery(
+            hass,
+            entry,
+            device_manager,
+            scan_interval,
+            scan_interval_max,
+            initial_discovery,
+        )
     )
     hass.data[DOMAIN][entry.entry_id]["scan_task"] = scan_task
 
+    # Let users force an immediate scan instead of lowering the interval
+    if not hass.services.has_service(DOMAIN, SERVICE_RESCAN):
+
+        async def _async_handle_rescan(call: ServiceCall) -> None:
+            """Wake every periodic discovery task."""
+            # A forced rescan must not reuse a recent UDP discovery result
+            hass.data.get(DOMAIN, {}).pop(IP_CACHE_KEY, None)
+            for entry_data in hass.data.get(DOMAIN, {}).values():
+                if isinstance(entry_data, dict) and "rescan_event" in entry_data:
+                    entry_data["rescan_event"].set()
+
+        hass.services.async_register(DOMAIN, SERVICE_RESCAN, _async_handle_rescan)
+
     # Setup reload listener
     entry.async_on_unload(entry.add_update_listener(async_reload_entry))
 
@@ -145,111 +172,305 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     data = hass.data[DOMAIN][entry.entry_id]
 
-    # Cancel scan task
+    # Wake and cancel scan task, and the initial discovery in case the scan
+    # task was cancelled before it got to await it
+    rescan_event = data.get("rescan_event")
+    if rescan_event:
+        rescan_event.set()
     scan_task = data.get("scan_task")
     if scan_task:
-        scan_task.cancel()
-        try:
-            await scan_task
-        except asyncio.CancelledError:
-            pass
+        await _async_cancel_task(scan_task)
+    initial_discovery = data.get("initial_discovery")
+    if initial_discovery:
+        await _async_cancel_task(initial_discovery)
 
-    # Disconnect all devices
+    # Disconnect all devices while unloading platforms
     device_manager: DeviceManager = data.get("device_manager")
-    if device_manager:
-        for device in device_manager.get_all_devices():
-            await device.async_disconnect()
-
-    # Unload platforms
-    unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    devices = device_manager.get_all_devices() if device_manager else []
+    disconnects = asyncio.gather(
+        *(device.async_disconnect() for device in devices),
+        return_exceptions=True,
+    )
+    if data.get("platforms_loaded"):
+        unload_ok, _ = await asyncio.gather(
+            hass.config_entries.async_unload_platforms(entry, PLATFORMS),
+            disconnects,
+        )
+    else:
+        await disconnects
+        unload_ok = True
 
     if unload_ok:
         hass.data[DOMAIN].pop(entry.entry_id, None)
+        # The rescan service is shared; keep it while other entries still use it
+        if not any(
+            isinstance(entry_data, dict) and "rescan_event" in entry_data
+            for entry_data in hass.data[DOMAIN].values()
+        ):
+            hass.services.async_remove(DOMAIN, SERVICE_RESCAN)
 
     return unload_ok
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Handle removal of a config entry."""
+    if DOMAIN in hass.data:
+        hass.data[DOMAIN].pop(IP_CACHE_KEY, None)
+
+
 async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Reload a config entry."""
     await async_unload_entry(hass, entry)
     await async_setup_entry(hass, entry)
 
 
+async def _async_cancel_task(task: asyncio.Task) -> None:
+    """Cancel a task and wait for it, retrieving any result or error."""
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
+    except Exception as e:
+        _LOGGER.debug("Task %s ended with an error: %s", task.get_name(), e)
+
+
+async def _async_cached_get_ip(hass: HomeAssistant) -> List[str]:
+    """Run UDP discovery, reusing a recent result if it has not expired."""
+    cache: _IpDiscoveryCache | None = hass.data[DOMAIN].get(IP_CACHE_KEY)
+    now = monotonic()
+    if cache is not None and now < cache.expires_at:
+        _LOGGER.debug("Using cached UDP discovery result")
+        return cache.ips
+
+    ips = await get_ip()
+    hass.data[DOMAIN][IP_CACHE_KEY] = _IpDiscoveryCache(now + IP_CACHE_TTL, ips)
+    return ips
+
+
+async def _async_discover_all_ips(
+    hass: HomeAssistant, ip_list_config: List[str], subnets_config: List[str]
+) -> Set[str]:
+    """Collect device IPs from UDP broadcast, configured IPs and subnet scans."""
+    # Discover devices via UDP broadcast
+    discovered_ips = await _async_cached_get_ip(hass)
+    _LOGGER.info(f"UDP discovery found {len(discovered_ips)} device(s): {discovered_ips}")
+
+    # Scan user-configured subnets concurrently (for cross-subnet discovery)
+    subnet_ips = []
+    if subnets_config:
+        _LOGGER.info(f"Scanning {len(subnets_config)} subnet(s) for cross-subnet devices: {subnets_config}")
+        subnet_results = await asyncio.gather(
+            *(scan_subnet_async(subnet, timeout=1.0) for subnet in subnets_config),
+            return_exceptions=True,
+        )
+        for subnet, result in zip(subnets_config, subnet_results):
+            if isinstance(result, Exception):
+                _LOGGER.error(f"Error scanning subnet {subnet}: {result}")
+            else:
+                subnet_ips.extend(result)
+
+    # Combine discovered IPs from all sources
+    return {*discovered_ips, *ip_list_config, *subnet_ips}
+
+
+async def _async_gather_connects(devices: List[CozyLifeDevice]) -> List[Any]:
+    """Connect devices concurrently, bounded by MAX_CONCURRENT_CONNECTS."""
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_CONNECTS)
+
+    async def _async_connect(device: CozyLifeDevice) -> bool:
+        async with semaphore:
+            return await device.async_connect()
+
+    return await asyncio.gather(
+        *(_async_connect(device) for device in devices), return_exceptions=True
+    )
+
+
+async def _async_connect_devices(ips: Iterable[str]) -> List[CozyLifeDevice]:
+    """Connect to devices concurrently and return the ones that connected."""
+    devices = [CozyLifeDevice(ip) for ip in ips]
+    results = await _async_gather_connects(devices)
+
+    connected = []
+    for device, result in zip(devices, results):
+        if isinstance(result, Exception):
+            _LOGGER.warning(f"Connect failed for {device.ip}: {result}")
+        elif result:
+            connected.append(device)
+            _LOGGER.info(f"Successfully connected to device at {device.ip}")
+        else:
+            _LOGGER.warning(f"Failed to connect to device at {device.ip}")
+
+    return connected
+
+
+async def _async_connect_new_ips(
+    device_manager: DeviceManager, ips: Set[str]
+) -> List[CozyLifeDevice]:
+    """Connect to newly seen IPs and return only devices that have no entities yet.
+
+    IPs of known devices are left to the reconnect pass. A known device that
+    answers on a different IP (e.g. after a DHCP lease change) is moved there,
+    so its existing entities keep working.
+    """
+    probed = await _async_connect_devices(
+        ip for ip in ips if device_manager.get_by_ip(ip) is None
+    )
+
+    new_devices = []
+    moved = []
+    for device in probed:
+        known = device_manager.get_device(device.device_id)
+        if known is None:
+            new_devices.append(device)
+            continue
+        await device.async_disconnect()
+        if known.is_available:
+            # Reachable on its old IP too; keep the working connection
+            continue
+        await known.async_disconnect()
+        device_manager.update_device_ip(known, device.ip)
+        moved.append(known)
+
+    if moved:
+        await _async_gather_connects(moved)
+    return new_devices
+
+
 async def _async_periodic_discovery(
     hass: HomeAssistant,
     entry: ConfigEntry,
     device_manager: DeviceManager,
     scan_interval: int,
+    scan_interval_max: int,
+    initial_discovery: asyncio.Task | None = None,
 ) -> None:
-    """Periodically discover new devices."""
+    """Periodically discover new devices, backing off while nothing changes.
+
+    When given, the result of initial_discovery (started during setup) is
+    processed first, without waiting for the scan interval.
+    """
+    # Entry data only changes on reload, which restarts this task
+    data = hass.data[DOMAIN][entry.entry_id]
+    tcp_clients: List[CozyLifeDevice] = data["tcp_clients"]
+    rescan_event: asyncio.Event = data["rescan_event"]
+    ip_list_config = entry.data.get("ip", [])
+    subnets_config = entry.data.get("subnets", [])
+    # IP -> consecutive scans it has been missing from
+    missed_scans: Dict[str, int] = {}
+    idle_cycles = 0
+    cycle = 0
     while True:
         try:
-            await asyncio.sleep(scan_interval)
-
-            _LOGGER.debug(f"Running periodic device discovery (interval: {scan_interval}s)")
-
-            # Perform UDP discovery
-            ip_list_config = entry.data.get("ip", [])
-            subnets_config = entry.data.get("subnets", [])
-
-            discovered_ips = await hass.async_add_executor_job(get_ip)
+            effective_interval = min(scan_interval * (2 ** idle_cycles), scan_interval_max)
+            if initial_discovery is not None:
+                discovery, initial_discovery = initial_discovery, None
+                all_ips = await discovery
+            else:
+                try:
+                    await asyncio.wait_for(rescan_event.wait(), timeout=effective_interval)
+                except asyncio.TimeoutError:
+                    pass
+                finally:
+                    rescan_event.clear()
 
-            # Scan user-configured subnets (for cross-subnet discovery)
-            subnet_ips = []
-            if subnets_config:
-                for subnet in subnets_config:
-                    try:
-                        ips = await scan_subnet_async(subnet, timeout=1.0)
-                        subnet_ips.extend(ips)
-                    except Exception as e:
-                        _LOGGER.debug(f"Error scanning subnet {subnet} in periodic discovery: {e}")
+                _LOGGER.debug("Running periodic device discovery (interval: %ss)", effective_interval)
 
-            all_ips = set(discovered_ips + ip_list_config + subnet_ips)
+                all_ips = await _async_discover_all_ips(hass, ip_list_config, subnets_config)
 
-            data = hass.data[DOMAIN][entry.entry_id]
+            cycle += 1
             last_scan_ips = data.get("last_scan_ips", set())
 
-            # Check for new devices
-            new_ips = all_ips - last_scan_ips
-            if new_ips:
-                _LOGGER.info(f"Found new devices: {new_ips}")
-
-                for ip in new_ips:
-                    try:
-                        device = CozyLifeDevice(ip)
-                        if await device.async_connect():
-                            device_manager.add_device(device)
-                            device_manager.register_device(device)
-                            data["tcp_clients"].append(device)
-                            _LOGGER.info(f"Successfully connected to new device at {ip}")
-
-                            # Reload platforms to add new entities
-                            await hass.config_entries.async_reload(entry.entry_id)
-                        else:
-                            _LOGGER.warning(f"Failed to connect to new device at {ip}")
-                    except Exception as e:
-                        _LOGGER.error(f"Error connecting to new device {ip}: {e}")
-
-            # Check for devices that disappeared
-            disappeared_ips = last_scan_ips - all_ips
-            if disappeared_ips:
-                _LOGGER.info(f"Devices no longer available: {disappeared_ips}")
-                for device in device_manager.get_all_devices():
-                    if device._ip in disappeared_ips:
-                        await device.async_disconnect()
-                        device_manager.remove_device(device.device_id)
-
-            # Update last scan IPs
-            data["last_scan_ips"] = all_ips
-
-            # Check device availability
-            for device in device_manager.get_all_devices():
-                if not device.is_available:
-                    try:
-                        _LOGGER.debug(f"Attempting to reconnect to {device._ip}")
-                        await device.async_connect()
-                    except Exception as e:
-                        _LOGGER.debug(f"Reconnection attempt failed: {e}")
+            # A single lost reply must not drop a device: keep missing IPs
+            # until they have been absent for several scans in a row
+            for ip in all_ips:
+                missed_scans.pop(ip, None)
+            for ip in last_scan_ips - all_ips:
+                missed_scans[ip] = missed_scans.get(ip, 0) + 1
+                if missed_scans[ip] < MISSED_SCANS_BEFORE_GONE:
+                    all_ips.add(ip)
+                else:
+                    del missed_scans[ip]
+            changed_ips = all_ips ^ last_scan_ips
+            disappeared_ips: Set[str] = set()
+
+            if changed_ips:
+                # Check for new devices
+                new_ips = changed_ips & all_ips
+                if new_ips:
+                    _LOGGER.info(f"Found new devices: {new_ips}")
+
+                    new_devices = await _async_connect_new_ips(device_manager, new_ips)
+                    device_manager.register_devices_bulk(new_devices)
+                    tcp_clients.extend(new_devices)
+
+                    if new_devices and data["platforms_loaded"]:
+                        # Let the platforms add entities for the new devices
+                        async_dispatcher_send(
+                            hass, SIGNAL_NEW_DEVICES.format(entry.entry_id), new_devices
+                        )
+
+                # Check for devices that disappeared; they stay in the manager
+                # so their entities come back with the reconnect pass below
+                disappeared_ips = changed_ips - all_ips
+                if disappeared_ips:
+                    _LOGGER.info(f"Devices no longer available: {disappeared_ips}")
+                    for ip in disappeared_ips:
+                        device = device_manager.get_by_ip(ip)
+                        if device:
+                            await device.async_disconnect()
+
+                # Update last scan IPs
+                data["last_scan_ips"] = all_ips
+
+            # First devices for this entry: platform setup picks them all up.
+            # Checked every cycle so a failed forward is retried on the next scan
+            if not data["platforms_loaded"] and device_manager.get_device_count():
+                # Flag first so an unload during the await still unloads them
+                data["platforms_loaded"] = True
+                try:
+                    await hass.config_entries.async_late_forward_entry_setups(
+                        entry, PLATFORMS
+                    )
+                except Exception:
+                    data["platforms_loaded"] = False
+                    raise
+
+            # Reconnect unavailable devices concurrently; a stable network only
+            # needs this on every AVAILABILITY_CHECK_CYCLES-th scan. Devices
+            # that just disappeared wait for a later cycle
+            unavailable = []
+            reconnected = False
+            if changed_ips or cycle % AVAILABILITY_CHECK_CYCLES == 0:
+                unavailable = [
+                    device
+                    for device in device_manager.iter_devices()
+                    if not device.is_available and device.ip not in disappeared_ips
+                ]
+            if unavailable:
+                _LOGGER.debug("Attempting to reconnect to %s device(s)", len(unavailable))
+                results = await _async_gather_connects(unavailable)
+                for device, result in zip(unavailable, results):
+                    if isinstance(result, Exception):
+                        _LOGGER.debug("Reconnection attempt to %s failed: %s", device.ip, result)
+                    elif result:
+                        reconnected = True
+
+            # Only devices that actually connected are worth a warm-start
+            # connect; configured or probed IPs that never answered are not
+            connected_ips = {
+                device.ip for device in device_manager.iter_devices() if device.is_available
+            }
+            if connected_ips != device_manager.known_ips:
+                device_manager.save_known_ips(connected_ips)
+
+            # Back off while the network is stable, scan at full rate after any
+            # change; devices that stay offline alone don't count as a change
+            if changed_ips or missed_scans or reconnected:
+                idle_cycles = 0
+            elif effective_interval < scan_interval_max:
+                idle_cycles += 1
 
         except asyncio.CancelledError:
             _LOGGER.debug("Periodic discovery task cancelled")
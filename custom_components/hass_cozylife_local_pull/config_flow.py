@@ -2,8 +2,10 @@
 """Config flow for CozyLife Local Pull integration."""
 from __future__ import annotations
 
+import ipaddress
 import logging
-from typing import Any, Dict
+import re
+from typing import Any, Callable, Dict, Tuple
 
 import voluptuous as vol
 from homeassistant import config_entries
@@ -11,10 +13,89 @@ from homeassistant.core import HomeAssistant
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.helpers import config_validation as cv
 
-from .const import DOMAIN, LANG
+from .const import DOMAIN, LANG, SCAN_INTERVAL_MAX_FACTOR
 
 _LOGGER = logging.getLogger(__name__)
 
+# IPs and subnets may be separated by commas and/or whitespace
+_TOKEN_SPLIT_RE = re.compile(r"[,\s]+")
+# Larger subnets would mean probing too many hosts on a TCP fallback scan
+MIN_SUBNET_PREFIX = 16
+
+
+def _parse_tokens(value: str) -> list[str]:
+    """Split a comma- or space-separated string into non-empty tokens."""
+    return [token for token in _TOKEN_SPLIT_RE.split(value.strip()) if token]
+
+
+def _normalize_ip(token: str) -> str:
+    """Validate an IPv4 device address and return its canonical form."""
+    try:
+        address = ipaddress.ip_address(token)
+    except ValueError as err:
+        raise vol.Invalid(f"Invalid IP address: {token}") from err
+    if address.version != 4:
+        raise vol.Invalid(f"Only IPv4 addresses are supported: {token}")
+    return str(address)
+
+
+def _normalize_subnet(token: str) -> str:
+    """Validate an IPv4 subnet of a scannable size and return its CIDR form."""
+    try:
+        network = ipaddress.ip_network(token, strict=False)
+    except ValueError as err:
+        raise vol.Invalid(f"Invalid subnet: {token}") from err
+    if network.version != 4:
+        raise vol.Invalid(f"Only IPv4 subnets are supported: {token}")
+    if network.prefixlen < MIN_SUBNET_PREFIX:
+        raise vol.Invalid(
+            f"Subnet {token} is too large, use /{MIN_SUBNET_PREFIX} or smaller"
+        )
+    return str(network)
+
+
+def _parse_address_input(
+    user_input: Dict[str, Any], errors: Dict[str, str]
+) -> Tuple[list[str], list[str]]:
+    """Parse and validate the IP and subnet fields, recording any field errors."""
+    ip_list: list[str] = []
+    subnets_list: list[str] = []
+    try:
+        ip_list = [
+            _normalize_ip(token)
+            for token in _parse_tokens(user_input.get("device_ips") or "")
+        ]
+    except vol.Invalid as err:
+        _LOGGER.warning(f"{err}")
+        errors["device_ips"] = "invalid_ip"
+    try:
+        subnets_list = [
+            _normalize_subnet(token)
+            for token in _parse_tokens(user_input.get("subnet_ranges") or "")
+        ]
+    except vol.Invalid as err:
+        _LOGGER.warning(f"{err}")
+        errors["subnet_ranges"] = "invalid_subnet"
+    return ip_list, subnets_list
+
+
+def _import_tokens(value: Any, normalize: Callable[[str], str]) -> list[str]:
+    """Normalize a YAML list or separated string, dropping invalid entries."""
+    if isinstance(value, list):
+        tokens = [str(token).strip() for token in value if str(token).strip()]
+    elif isinstance(value, str):
+        tokens = _parse_tokens(value)
+    else:
+        return []
+
+    result = []
+    for token in tokens:
+        try:
+            result.append(normalize(token))
+        except vol.Invalid as err:
+            _LOGGER.warning(f"Ignoring YAML entry: {err}")
+    return result
+
 
 def _get_user_schema() -> vol.Schema:
     """Get the user configuration schema with field names."""
@@ -44,32 +125,10 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         errors: Dict[str, str] = {}
 
         if user_input is not None:
-            # Parse the device IP addresses
-            ip_list = []
-            if user_input.get("device_ips"):
-                ip_str = user_input["device_ips"].strip()
-                if ip_str:
-                    # Support comma-separated or space-separated IPs
-                    ips = [
-                        ip.strip()
-                        for ip in ip_str.replace(",", " ").split()
-                        if ip.strip()
-                    ]
-                    ip_list = ips
-
-            # Parse the subnet ranges
-            subnets_list = []
-            if user_input.get("subnet_ranges"):
-                subnet_str = user_input["subnet_ranges"].strip()
-                if subnet_str:
-                    # Support comma-separated or space-separated subnets
-                    subnets = [
-                        subnet.strip()
-                        for subnet in subnet_str.replace(",", " ").split()
-                        if subnet.strip()
-                    ]
-                    subnets_list = subnets
+            # Parse the device IP addresses and subnet ranges
+            ip_list, subnets_list = _parse_address_input(user_input, errors)
 
+        if user_input is not None and not errors:
             # Validate language
             lang = user_input.get("lang", LANG)
 
@@ -89,9 +148,14 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 data=data,
             )
 
+        data_schema = _get_user_schema()
+        if user_input is not None:
+            # Keep what the user typed when showing validation errors
+            data_schema = self.add_suggested_values_to_schema(data_schema, user_input)
+
         return self.async_show_form(
             step_id="user",
-            data_schema=_get_user_schema(),
+            data_schema=data_schema,
             errors=errors,
             description_placeholders={
                 "guide": (
@@ -101,7 +165,7 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                     "Leave empty for auto-discovery via UDP broadcast.\n\n"
                     "**Subnet Ranges to Scan (Optional)**\n"
                     "Auto-scan these subnets for devices (useful for cross-subnet discovery).\n"
-                    "Format: 192.168.2.0/24 192.168.4.0/24 (CIDR format, space or comma separated)\n"
+                    "Format: 192.168.2.0/24 192.168.4.0/24 (IPv4 CIDR, /16 or smaller, space or comma separated)\n"
                     "Leave empty if all devices are on the same network as Home Assistant.\n\n"
                     "**Scan Interval (Seconds)**\n"
                     "Minimum: 60, Recommended: 300 (5 minutes)\n\n"
@@ -112,15 +176,9 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
     async def async_step_import(self, import_data: Dict[str, Any]) -> FlowResult:
         """Handle import from YAML configuration."""
-        # Parse the IP addresses
-        ip_list = []
-        if isinstance(import_data.get("ip"), list):
-            ip_list = import_data["ip"]
-
-        # Parse the subnets
-        subnets_list = []
-        if isinstance(import_data.get("subnets"), list):
-            subnets_list = import_data["subnets"]
+        # Parse the IP addresses and subnets (YAML lists or separated strings)
+        ip_list = _import_tokens(import_data.get("ip"), _normalize_ip)
+        subnets_list = _import_tokens(import_data.get("subnets"), _normalize_subnet)
 
         # Create config entry from YAML
         data = {
@@ -150,33 +208,13 @@ class OptionsFlow(config_entries.OptionsFlow):
         self, user_input: Dict[str, Any] | None = None
     ) -> FlowResult:
         """Handle the initial step."""
+        errors: Dict[str, str] = {}
+
         if user_input is not None:
-            # Parse the device IP addresses
-            ip_list = []
-            if user_input.get("device_ips"):
-                ip_str = user_input["device_ips"].strip()
-                if ip_str:
-                    # Support comma-separated or space-separated IPs
-                    ips = [
-                        ip.strip()
-                        for ip in ip_str.replace(",", " ").split()
-                        if ip.strip()
-                    ]
-                    ip_list = ips
-
-            # Parse the subnet ranges
-            subnets_list = []
-            if user_input.get("subnet_ranges"):
-                subnet_str = user_input["subnet_ranges"].strip()
-                if subnet_str:
-                    # Support comma-separated or space-separated subnets
-                    subnets = [
-                        subnet.strip()
-                        for subnet in subnet_str.replace(",", " ").split()
-                        if subnet.strip()
-                    ]
-                    subnets_list = subnets
+            # Parse the device IP addresses and subnet ranges
+            ip_list, subnets_list = _parse_address_input(user_input, errors)
 
+        if user_input is not None and not errors:
             # Update config entry data with new IP and subnet lists
             # (using old field names for backward compatibility)
             self.hass.config_entries.async_update_entry(
@@ -188,10 +226,20 @@ class OptionsFlow(config_entries.OptionsFlow):
                 },
             )
 
-            # Update options with scan_interval
+            # Update options with scan_interval and the idle backoff ceiling
+            scan_interval = user_input.get("scan_interval", 300)
             return self.async_create_entry(
                 title="",
-                data={"scan_interval": user_input.get("scan_interval", 300)},
+                data={
+                    "scan_interval": scan_interval,
+                    "scan_interval_max": max(
+                        user_input.get(
+                            "scan_interval_max",
+                            scan_interval * SCAN_INTERVAL_MAX_FACTOR,
+                        ),
+                        scan_interval,
+                    ),
+                },
             )
 
         # Get current IP list from config entry data
@@ -203,6 +251,9 @@ class OptionsFlow(config_entries.OptionsFlow):
         subnet_str = " ".join(current_subnets) if current_subnets else ""
 
         current_scan_interval = self.config_entry.options.get("scan_interval", 300)
+        current_scan_interval_max = self.config_entry.options.get(
+            "scan_interval_max", current_scan_interval * SCAN_INTERVAL_MAX_FACTOR
+        )
 
         options_schema = vol.Schema(
             {
@@ -218,12 +269,22 @@ class OptionsFlow(config_entries.OptionsFlow):
                     "scan_interval",
                     default=current_scan_interval,
                 ): vol.All(cv.positive_int, vol.Range(min=60)),
+                vol.Optional(
+                    "scan_interval_max",
+                    default=current_scan_interval_max,
+                ): vol.All(cv.positive_int, vol.Range(min=60)),
             }
         )
+        if user_input is not None:
+            # Keep what the user typed when showing validation errors
+            options_schema = self.add_suggested_values_to_schema(
+                options_schema, user_input
+            )
 
         return self.async_show_form(
             step_id="init",
             data_schema=options_schema,
+            errors=errors,
             description_placeholders={
                 "guide": (
                     "**Device IP Addresses (Optional)**\n"
@@ -232,10 +293,13 @@ class OptionsFlow(config_entries.OptionsFlow):
                     "Leave empty for auto-discovery.\n\n"
                     "**Subnet Ranges to Scan (Optional)**\n"
                     "Auto-scan these subnets for devices (cross-subnet discovery).\n"
-                    "Format: 192.168.2.0/24 192.168.4.0/24 (CIDR format, space or comma separated)\n"
+                    "Format: 192.168.2.0/24 192.168.4.0/24 (IPv4 CIDR, /16 or smaller, space or comma separated)\n"
                     "Leave empty if all devices are on same network.\n\n"
                     "**Scan Interval (Seconds)**\n"
-                    "How often to scan for new devices. Minimum: 60, Recommended: 300 (5 minutes)"
+                    "How often to scan for new devices. Minimum: 60, Recommended: 300 (5 minutes)\n\n"
+                    "**Maximum Scan Interval (Seconds)**\n"
+                    "While nothing changes, scans back off up to this interval. "
+                    "Call the `rescan` service to scan immediately."
                 ),
             },
         )
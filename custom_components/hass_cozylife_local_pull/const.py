@@ -1,5 +1,11 @@
 DOMAIN = "hass_cozylife_local_pull"
 
+# Idle scans back off up to scan_interval * this factor unless configured otherwise
+SCAN_INTERVAL_MAX_FACTOR = 8
+
+# Dispatcher signal carrying devices connected after setup, formatted with the entry id
+SIGNAL_NEW_DEVICES = f"{DOMAIN}_{{}}_new_devices"
+
 # http://doc.doit/project-5/doc-8/
 SWITCH_TYPE_CODE = '00'
 LIGHT_TYPE_CODE = '01'
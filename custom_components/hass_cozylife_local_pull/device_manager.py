@@ -3,17 +3,22 @@
 from __future__ import annotations
 
 import logging
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Set, ValuesView
 
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.device_registry import DeviceRegistry
 from homeassistant.helpers.entity_registry import EntityRegistry
+from homeassistant.helpers.storage import Store
 
 from .const import DOMAIN
 from .tcp_client import CozyLifeDevice
 
 _LOGGER = logging.getLogger(__name__)
 
+STORAGE_VERSION = 1
+STORAGE_KEY = f"{DOMAIN}_known_ips"
+STORAGE_SAVE_DELAY = 10
+
 
 class DeviceManager:
     """Manages devices and their registry entries."""
@@ -23,8 +28,11 @@ class DeviceManager:
         self.hass = hass
         self.config_entry_id = config_entry_id
         self.devices: Dict[str, CozyLifeDevice] = {}
+        self._by_ip: Dict[str, CozyLifeDevice] = {}
         self._device_registry: Optional[DeviceRegistry] = None
         self._entity_registry: Optional[EntityRegistry] = None
+        self._store: Store = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+        self.known_ips: Set[str] = set()
 
     async def async_setup(self) -> None:
         """Set up the device manager."""
@@ -34,25 +42,52 @@ class DeviceManager:
         self._device_registry = async_get_dev_reg(self.hass)
         self._entity_registry = async_get_ent_reg(self.hass)
 
+        # Load device IPs persisted by a previous run for a faster warm start
+        stored = await self._store.async_load()
+        if isinstance(stored, list):
+            self.known_ips = set(stored)
+            _LOGGER.debug("Loaded %s known device IP(s)", len(self.known_ips))
+
+    def save_known_ips(self, ips: Iterable[str]) -> None:
+        """Persist device IPs so they can be contacted first on next startup."""
+        self.known_ips = set(ips)
+        self._store.async_delay_save(
+            lambda: sorted(self.known_ips), STORAGE_SAVE_DELAY
+        )
+
     def add_device(self, device: CozyLifeDevice) -> None:
         """Add a device to the manager."""
         device_id = device.device_id
         if device_id not in self.devices:
             self.devices[device_id] = device
-            _LOGGER.debug(f"Added device: {device_id} ({device.device_model_name})")
+            self._by_ip[device.ip] = device
+            _LOGGER.debug("Added device: %s (%s)", device_id, device.device_model_name)
         else:
-            _LOGGER.debug(f"Device already exists: {device_id}")
+            _LOGGER.debug("Device already exists: %s", device_id)
 
     def remove_device(self, device_id: str) -> None:
         """Remove a device from the manager."""
         if device_id in self.devices:
-            del self.devices[device_id]
-            _LOGGER.debug(f"Removed device: {device_id}")
+            device = self.devices.pop(device_id)
+            self._by_ip.pop(device.ip, None)
+            _LOGGER.debug("Removed device: %s", device_id)
+
+    def update_device_ip(self, device: CozyLifeDevice, ip: str) -> None:
+        """Move a known device to a new IP address, keeping the same object."""
+        if self._by_ip.get(device.ip) is device:
+            del self._by_ip[device.ip]
+        device.set_ip(ip)
+        self._by_ip[ip] = device
+        _LOGGER.debug("Device %s moved to %s", device.device_id, ip)
 
     def get_device(self, device_id: str) -> Optional[CozyLifeDevice]:
         """Get a device by ID."""
         return self.devices.get(device_id)
 
+    def get_by_ip(self, ip: str) -> Optional[CozyLifeDevice]:
+        """Get a device by IP address."""
+        return self._by_ip.get(ip)
+
     def get_devices_by_type(self, device_type: str) -> List[CozyLifeDevice]:
         """Get all devices of a specific type."""
         return [
@@ -81,14 +116,27 @@ class DeviceManager:
                 model=device.device_model_name,
                 sw_version=getattr(device, "software_version", "Unknown"),
             )
-            _LOGGER.debug(f"Registered device in device registry: {device.device_id}")
+            _LOGGER.debug("Registered device in device registry: %s", device.device_id)
         except Exception as e:
             _LOGGER.error(f"Failed to register device {device.device_id}: {e}")
 
+    def register_devices_bulk(self, devices: Iterable[CozyLifeDevice]) -> None:
+        """Add and register a batch of newly connected devices in one pass."""
+        count = 0
+        for device in devices:
+            self.add_device(device)
+            self.register_device(device)
+            count += 1
+        _LOGGER.debug("Registered %s device(s)", count)
+
     def get_all_devices(self) -> List[CozyLifeDevice]:
-        """Get all devices."""
+        """Get a snapshot list of all devices."""
         return list(self.devices.values())
 
+    def iter_devices(self) -> ValuesView[CozyLifeDevice]:
+        """Get a live view of all devices, for callers that only iterate."""
+        return self.devices.values()
+
     def get_device_count(self) -> int:
         """Get total device count."""
         return len(self.devices)
@@ -96,3 +144,4 @@ class DeviceManager:
     def clear(self) -> None:
         """Clear all devices."""
         self.devices.clear()
+        self._by_ip.clear()
@@ -1,8 +1,9 @@
 """Light platform for CozyLife Local Pull integration."""
 from __future__ import annotations
 
+import asyncio
 import logging
-from typing import Any
+from typing import Any, Dict, List, Optional
 
 from homeassistant.components.light import (
     ATTR_BRIGHTNESS,
@@ -14,12 +15,11 @@ from homeassistant.components.light import (
     DEFAULT_MIN_KELVIN,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.util import color as colorutil
 
-from .const import DOMAIN, LIGHT_TYPE_CODE
+from .const import DOMAIN, LIGHT_TYPE_CODE, SIGNAL_NEW_DEVICES
 from .tcp_client import CozyLifeDevice
 
 _LOGGER = logging.getLogger(__name__)
@@ -46,36 +46,65 @@ async def async_setup_entry(
     # Get all light devices
     light_devices = device_manager.get_devices_by_type(LIGHT_TYPE_CODE)
 
-    lights = [CozyLifeLight(device) for device in light_devices]
+    # Query initial states concurrently rather than one entity at a time
+    states = await asyncio.gather(
+        *(device.async_query() for device in light_devices), return_exceptions=True
+    )
+    lights = [
+        CozyLifeLight(device, None if isinstance(state, Exception) else state)
+        for device, state in zip(light_devices, states)
+    ]
 
     async_add_entities(lights)
     _LOGGER.info(f"Added {len(lights)} light entities")
 
+    @callback
+    def _async_add_new_devices(devices: List[CozyLifeDevice]) -> None:
+        """Add entities for devices connected after setup."""
+        new_lights = [
+            CozyLifeLight(device)
+            for device in devices
+            if device.device_type_code == LIGHT_TYPE_CODE
+        ]
+        if new_lights:
+            async_add_entities(new_lights)
+            _LOGGER.info(f"Added {len(new_lights)} new light entities")
+
+    config_entry.async_on_unload(
+        async_dispatcher_connect(
+            hass,
+            SIGNAL_NEW_DEVICES.format(config_entry.entry_id),
+            _async_add_new_devices,
+        )
+    )
+
 
 class CozyLifeLight(LightEntity):
     """Representation of a CozyLife light."""
 
     _attr_has_entity_name = True
 
-    def __init__(self, device: CozyLifeDevice) -> None:
+    def __init__(
+        self, device: CozyLifeDevice, initial_state: Optional[Dict[str, Any]] = None
+    ) -> None:
         """Initialize the light."""
         self._device = device
         self._attr_unique_id = device.device_id
         self._attr_name = f"{device.device_model_name}"
 
         # Set device info to associate this entity with the device
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, device.device_id)},
-            manufacturer="CozyLife",
-            model=device.device_model_name,
-            name=device.device_model_name,
-        )
-
-        # Calculate color temperature limits (Mireds)
-        # Cold: 6500K, Warm: 2700K
-        self._min_mireds = colorutil.color_temperature_kelvin_to_mired(6500)
-        self._max_mireds = colorutil.color_temperature_kelvin_to_mired(2700)
-        self._miredsratio = (self._max_mireds - self._min_mireds) / 1000
+        self._attr_device_info = device.device_info
+
+        # Color temperature maps linearly in mireds onto dpid 3 (0-1000)
+        # Cold: 6500K -> 1000, Warm: 2700K -> 0
+        # Folded into dpid3 = a / kelvin + b and kelvin = a / (dpid3 + b)
+        min_mireds = 1000000 / 6500
+        max_mireds = 1000000 / 2700
+        mireds_ratio = (max_mireds - min_mireds) / 1000
+        self._k_to_dpid_a = -1000000 / mireds_ratio
+        self._k_to_dpid_b = 1000 + min_mireds / mireds_ratio
+        self._dpid_to_k_a = -1000000 / mireds_ratio
+        self._dpid_to_k_b = -max_mireds / mireds_ratio
         self._attr_min_color_temp_kelvin = DEFAULT_MIN_KELVIN
         self._attr_max_color_temp_kelvin = DEFAULT_MAX_KELVIN
 
@@ -96,9 +125,11 @@ class CozyLifeLight(LightEntity):
             self._attr_supported_color_modes.add(ColorMode.HS)
 
         _LOGGER.debug(
-            f"Device {device.device_id}: dpid={device.dpid}, "
-            f"color_mode={self._attr_color_mode}, "
-            f"supported_color_modes={self._attr_supported_color_modes}"
+            "Device %s: dpid=%s, color_mode=%s, supported_color_modes=%s",
+            device.device_id,
+            device.dpid,
+            self._attr_color_mode,
+            self._attr_supported_color_modes,
         )
 
         # Initialize state with sensible defaults (not None)
@@ -109,9 +140,17 @@ class CozyLifeLight(LightEntity):
         self._attr_hs_color = (0, 0)  # Black/off state for HS
 
         _LOGGER.debug(
-            f"Initialized light {self._attr_unique_id} with color mode: {self._attr_color_mode}, supported: {self._attr_supported_color_modes}"
+            "Initialized light %s with color mode: %s, supported: %s",
+            self._attr_unique_id,
+            self._attr_color_mode,
+            self._attr_supported_color_modes,
         )
 
+        # Apply a state already queried during platform setup
+        self._has_initial_state = bool(initial_state)
+        if initial_state:
+            self._apply_state(initial_state)
+
     @property
     def available(self) -> bool:
         """Return if the device is available."""
@@ -121,8 +160,9 @@ class CozyLifeLight(LightEntity):
     async def async_added_to_hass(self) -> None:
         """Run when entity is added to Home Assistant."""
         await super().async_added_to_hass()
-        # Fetch initial state from device
-        await self.async_update()
+        # Fetch initial state from device unless setup already queried it
+        if not self._has_initial_state:
+            await self.async_update()
 
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn the light on."""
@@ -136,47 +176,50 @@ class CozyLifeLight(LightEntity):
 
         # Handle HS color (dpid 5, 6)
         if hs_color is not None:
-            r, g, b = colorutil.color_hs_to_RGB(*hs_color)
-            converted_hs = colorutil.color_RGB_to_hs(r, g, b)
-            payload["5"] = round(converted_hs[0])
-            payload["6"] = round(converted_hs[1] * 10)
+            payload["5"] = round(hs_color[0])
+            payload["6"] = round(hs_color[1] * 10)
             self._attr_hs_color = hs_color
             self._attr_color_mode = ColorMode.HS
-            _LOGGER.debug(f"HS color: HA H={hs_color[0]}, S={hs_color[1]}, payload 5={payload['5']}, 6={payload['6']}")
+            _LOGGER.debug("HS color: HA H=%s, S=%s, payload 5=%s, 6=%s", hs_color[0], hs_color[1], payload['5'], payload['6'])
 
         # Handle color temperature (dpid 3)
         if colortemp_kelvin is not None:
-            mireds = colorutil.color_temperature_kelvin_to_mired(colortemp_kelvin)
-            payload["3"] = round(1000 - (mireds - self._min_mireds) / self._miredsratio)
+            payload["3"] = round(self._k_to_dpid_a / colortemp_kelvin + self._k_to_dpid_b)
             self._attr_color_temp_kelvin = colortemp_kelvin
             self._attr_color_mode = ColorMode.COLOR_TEMP
-            _LOGGER.debug(f"Color temp: Kelvin={colortemp_kelvin}, payload={payload['3']}")
+            _LOGGER.debug("Color temp: Kelvin=%s, payload=%s", colortemp_kelvin, payload['3'])
 
         # Handle brightness (dpid 4) - applies to all modes
         if brightness is not None:
             payload["4"] = round(brightness / 255 * 1000)
             self._attr_brightness = brightness
-            _LOGGER.debug(f"Brightness: HA={brightness}, payload={payload['4']}")
+            _LOGGER.debug("Brightness: HA=%s, payload=%s", brightness, payload['4'])
 
         _LOGGER.info(f"Sending payload: {payload}")
         await self._device.async_control(payload)
         self._attr_is_on = True
+        # Brightness/color may have changed even if the light was already on
         self.async_write_ha_state()
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn the light off."""
         await self._device.async_control({"1": 0})
-        self._attr_is_on = False
-        self.async_write_ha_state()
+        if self._attr_is_on is not False:
+            self._attr_is_on = False
+            self.async_write_ha_state()
 
     async def async_update(self) -> None:
         """Update the light state from device."""
         state = await self._device.async_query()
         if not state:
-            _LOGGER.debug(f"Failed to query device {self._attr_unique_id}, device may be initializing")
+            _LOGGER.debug("Failed to query device %s, device may be initializing", self._attr_unique_id)
             return
 
-        _LOGGER.debug(f"Device state: {state}")
+        self._apply_state(state)
+
+    def _apply_state(self, state: Dict[str, Any]) -> None:
+        """Update attributes from a device state."""
+        _LOGGER.debug("Device state: %s", state)
 
         # Update on/off state (dpid 1)
         if "1" in state:
@@ -193,7 +236,7 @@ class CozyLifeLight(LightEntity):
             # Validate brightness value
             if 0 <= brightness_value <= 1000:
                 self._attr_brightness = int(brightness_value / 1000 * 255)
-                _LOGGER.debug(f"Brightness: dpid 4={brightness_value} → {self._attr_brightness}")
+                _LOGGER.debug("Brightness: dpid 4=%s → %s", brightness_value, self._attr_brightness)
 
         # Only update color values when device is in normal mode (dpid 2 == 0)
         if device_mode == 0:
@@ -202,11 +245,12 @@ class CozyLifeLight(LightEntity):
                 device_value = int(state["3"])
                 # Validate color temp value (skip if > 60000, indicating invalid data)
                 if 0 <= device_value < 60000:
-                    mireds = self._max_mireds - (device_value * self._miredsratio)
-                    if mireds > 0:
-                        self._attr_color_temp_kelvin = int(1000000 / mireds)
+                    # Denominator must stay negative for a positive mired value
+                    denominator = device_value + self._dpid_to_k_b
+                    if denominator < 0:
+                        self._attr_color_temp_kelvin = int(self._dpid_to_k_a / denominator)
                         self._attr_color_mode = ColorMode.COLOR_TEMP
-                        _LOGGER.debug(f"Color temp: dpid 3={device_value} → {self._attr_color_temp_kelvin}K")
+                        _LOGGER.debug("Color temp: dpid 3=%s → %sK", device_value, self._attr_color_temp_kelvin)
 
             # Update HS color (dpid 5, 6) if present
             if "5" in state and "6" in state:
@@ -214,9 +258,7 @@ class CozyLifeLight(LightEntity):
                 s_device = int(state["6"] / 10)
                 # Validate HS values (skip if > 60000, indicating invalid data)
                 if h_device < 60000 and s_device < 60000:
-                    # Convert through RGB for proper color space handling
-                    r, g, b = colorutil.color_hs_to_RGB(h_device, s_device)
-                    h_ha, s_ha = colorutil.color_RGB_to_hs(r, g, b)
-                    self._attr_hs_color = (h_ha, s_ha)
+                    # Device reports H/S directly, no color space conversion needed
+                    self._attr_hs_color = (float(h_device), float(s_device))
                     self._attr_color_mode = ColorMode.HS
-                    _LOGGER.debug(f"HS color: dpid 5={state['5']}, dpid 6={state['6']} → H={h_ha}, S={s_ha}")
+                    _LOGGER.debug("HS color: dpid 5=%s, dpid 6=%s → H=%s, S=%s", state['5'], state['6'], h_device, s_device)
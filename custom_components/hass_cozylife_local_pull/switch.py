@@ -1,16 +1,17 @@
 """Switch platform for CozyLife Local Pull integration."""
 from __future__ import annotations
 
+import asyncio
 import logging
-from typing import Any
+from typing import Any, Dict, List, Optional
 
 from homeassistant.components.switch import SwitchEntity
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .const import DOMAIN, SWITCH_TYPE_CODE
+from .const import DOMAIN, SWITCH_TYPE_CODE, SIGNAL_NEW_DEVICES
 from .tcp_client import CozyLifeDevice
 
 _LOGGER = logging.getLogger(__name__)
@@ -37,18 +38,47 @@ async def async_setup_entry(
     # Get all switch devices
     switch_devices = device_manager.get_devices_by_type(SWITCH_TYPE_CODE)
 
-    switches = [CozyLifeSwitch(device) for device in switch_devices]
+    # Query initial states concurrently rather than one entity at a time
+    states = await asyncio.gather(
+        *(device.async_query() for device in switch_devices), return_exceptions=True
+    )
+    switches = [
+        CozyLifeSwitch(device, None if isinstance(state, Exception) else state)
+        for device, state in zip(switch_devices, states)
+    ]
 
     async_add_entities(switches)
     _LOGGER.info(f"Added {len(switches)} switch entities")
 
+    @callback
+    def _async_add_new_devices(devices: List[CozyLifeDevice]) -> None:
+        """Add entities for devices connected after setup."""
+        new_switches = [
+            CozyLifeSwitch(device)
+            for device in devices
+            if device.device_type_code == SWITCH_TYPE_CODE
+        ]
+        if new_switches:
+            async_add_entities(new_switches)
+            _LOGGER.info(f"Added {len(new_switches)} new switch entities")
+
+    config_entry.async_on_unload(
+        async_dispatcher_connect(
+            hass,
+            SIGNAL_NEW_DEVICES.format(config_entry.entry_id),
+            _async_add_new_devices,
+        )
+    )
+
 
 class CozyLifeSwitch(SwitchEntity):
     """Representation of a CozyLife switch."""
 
     _attr_has_entity_name = True
 
-    def __init__(self, device: CozyLifeDevice) -> None:
+    def __init__(
+        self, device: CozyLifeDevice, initial_state: Optional[Dict[str, Any]] = None
+    ) -> None:
         """Initialize the switch."""
         self._device = device
         self._attr_unique_id = device.device_id
@@ -57,14 +87,14 @@ class CozyLifeSwitch(SwitchEntity):
         self._attr_is_on = None
 
         # Set device info to associate this entity with the device
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, device.device_id)},
-            manufacturer="CozyLife",
-            model=device.device_model_name,
-            name=device.device_model_name,
-        )
+        self._attr_device_info = device.device_info
 
-        _LOGGER.debug(f"Initialized switch {self._attr_unique_id}")
+        _LOGGER.debug("Initialized switch %s", self._attr_unique_id)
+
+        # Apply a state already queried during platform setup
+        self._has_initial_state = bool(initial_state)
+        if initial_state:
+            self._apply_state(initial_state)
 
     @property
     def available(self) -> bool:
@@ -74,31 +104,38 @@ class CozyLifeSwitch(SwitchEntity):
     async def async_added_to_hass(self) -> None:
         """Run when entity is added to Home Assistant."""
         await super().async_added_to_hass()
-        # Fetch initial state from device
-        await self.async_update()
+        # Fetch initial state from device unless setup already queried it
+        if not self._has_initial_state:
+            await self.async_update()
 
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn the switch on."""
         await self._device.async_control({"1": 255})
-        self._attr_is_on = True
-        self.async_write_ha_state()
+        if self._attr_is_on is not True:
+            self._attr_is_on = True
+            self.async_write_ha_state()
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn the switch off."""
         await self._device.async_control({"1": 0})
-        self._attr_is_on = False
-        self.async_write_ha_state()
+        if self._attr_is_on is not False:
+            self._attr_is_on = False
+            self.async_write_ha_state()
 
     async def async_update(self) -> None:
         """Update the switch state."""
         state = await self._device.async_query()
         if not state:
-            _LOGGER.debug(f"Failed to query device {self._attr_unique_id}, device may be initializing")
+            _LOGGER.debug("Failed to query device %s, device may be initializing", self._attr_unique_id)
             # Set sensible default on first query failure
             if self._attr_is_on is None:
                 self._attr_is_on = False
             return
 
+        self._apply_state(state)
+
+    def _apply_state(self, state: Dict[str, Any]) -> None:
+        """Update attributes from a device state."""
         if "1" in state:
             self._attr_is_on = state["1"] > 0
         else:
@@ -9,15 +9,42 @@ from typing import Any, Dict, Optional, Union
 
 import logging
 
-from .utils import get_pid_list, get_sn
+from homeassistant.helpers.device_registry import DeviceInfo
+
+from .const import DOMAIN
+from .utils import async_get_pid_info, get_sn
 
 _LOGGER = logging.getLogger(__name__)
 
+# orjson ships with Home Assistant; fall back to json when run standalone
+try:
+    import orjson
+    _json_dumps = orjson.dumps
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+
 CMD_INFO = 0
 CMD_QUERY = 2
 CMD_SET = 3
 CMD_LIST = [CMD_INFO, CMD_QUERY, CMD_SET]
 
+# Pre-serialized frames for the fixed-shape commands; only the sn varies
+_QUERY_TMPL = b'{"pv":0,"cmd":2,"sn":"%s","msg":{"attr":[0]}}\r\n'
+_INFO_TMPL = b'{"pv":0,"cmd":0,"sn":"%s","msg":{}}\r\n'
+
+# TCP keepalive so dead peers are detected without waiting for a command
+KEEPALIVE_IDLE = 30
+KEEPALIVE_INTERVAL = 10
+KEEPALIVE_COUNT = 3
+
+# Largest response frame we buffer before discarding it as malformed
+READ_LIMIT = 65536
+
 
 class CozyLifeDevice:
     """
@@ -47,12 +74,23 @@ class CozyLifeDevice:
         self._device_model_name: str = ""
         self._dpid: list = []
         self._sn: str = ""
+        self._sn_bytes: bytes = b""
         self._software_version: str = "Unknown"
+        self._device_info: Optional[DeviceInfo] = None
     @property
     def is_available(self) -> bool:
         """Return whether the device is available."""
         return self._is_available
 
+    @property
+    def ip(self) -> str:
+        """Return the device IP address."""
+        return self._ip
+
+    def set_ip(self, ip: str) -> None:
+        """Point the device at a new IP address, used on the next connect."""
+        self._ip = ip
+
     @property
     def device_id(self) -> str:
         """Return the device ID."""
@@ -88,13 +126,26 @@ class CozyLifeDevice:
         """Return the software version."""
         return self._software_version
 
+    @property
+    def device_info(self) -> DeviceInfo:
+        """Return device registry info, shared by all entities of this device."""
+        if self._device_info is None:
+            self._device_info = DeviceInfo(
+                identifiers={(DOMAIN, self._device_id)},
+                manufacturer="CozyLife",
+                model=self._device_model_name,
+                name=self._device_model_name,
+            )
+        return self._device_info
+
     async def async_connect(self) -> bool:
         """Connect to the device asynchronously."""
         try:
             self._reader, self._writer = await asyncio.wait_for(
-                asyncio.open_connection(self._ip, self._port),
+                asyncio.open_connection(self._ip, self._port, limit=READ_LIMIT),
                 timeout=10.0,
             )
+            self._enable_keepalive()
             await self._async_device_info()
             self._is_available = True
             _LOGGER.info(f"Connected to device at {self._ip}")
@@ -108,6 +159,24 @@ class CozyLifeDevice:
             self._is_available = False
             return False
 
+    def _enable_keepalive(self) -> None:
+        """Enable TCP keepalive on the device socket where supported."""
+        sock = self._writer.get_extra_info("socket") if self._writer else None
+        if sock is None:
+            return
+        try:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+            # Tuning options are platform specific (TCP_KEEPIDLE is Linux-only)
+            for option, value in (
+                ("TCP_KEEPIDLE", KEEPALIVE_IDLE),
+                ("TCP_KEEPINTVL", KEEPALIVE_INTERVAL),
+                ("TCP_KEEPCNT", KEEPALIVE_COUNT),
+            ):
+                if hasattr(socket, option):
+                    sock.setsockopt(socket.IPPROTO_TCP, getattr(socket, option), value)
+        except OSError as e:
+            _LOGGER.debug("Could not enable keepalive for %s: %s", self._ip, e)
+
     async def async_disconnect(self) -> None:
         """Disconnect from the device."""
         if self._writer:
@@ -138,63 +207,48 @@ class CozyLifeDevice:
                 return
 
             # Get product information
-            pid_list = await asyncio.get_event_loop().run_in_executor(
-                None, get_pid_list
-            )
-
-            for item in pid_list:
-                if item.get("m"):
-                    for model in item["m"]:
-                        if model.get("pid") == self._pid:
-                            self._icon = model.get("i", "")
-                            self._device_model_name = model.get("n", "")
-                            self._dpid = model.get("dpid", [])
-                            self._device_type_code = item.get("c", "")
-                            _LOGGER.info(
-                                f"Device info - ID: {self._device_id}, "
-                                f"Model: {self._device_model_name}, "
-                                f"Type: {self._device_type_code}"
-                            )
-                            return
+            info = await async_get_pid_info(self._pid)
+            if info:
+                (
+                    self._icon,
+                    self._device_model_name,
+                    self._dpid,
+                    self._device_type_code,
+                ) = info
+                _LOGGER.info(
+                    f"Device info - ID: {self._device_id}, "
+                    f"Model: {self._device_model_name}, "
+                    f"Type: {self._device_type_code}"
+                )
+                return
 
             _LOGGER.warning(
                 f"Could not find product info for PID: {self._pid}"
             )
         except Exception as e:
             _LOGGER.error(f"Error getting device info: {e}")
+
     def _get_package(self, cmd: int, payload: Dict[str, Any]) -> bytes:
         """Package a message for the device."""
         self._sn = get_sn()
-        if cmd == CMD_SET:
-            message = {
-                "pv": 0,
-                "cmd": cmd,
-                "sn": self._sn,
-                "msg": {
-                    "attr": [int(item) for item in payload.keys()],
-                    "data": payload,
-                },
-            }
-        elif cmd == CMD_QUERY:
-            message = {
-                "pv": 0,
-                "cmd": cmd,
-                "sn": self._sn,
-                "msg": {"attr": [0]},
-            }
+        self._sn_bytes = self._sn.encode()
+        if cmd == CMD_QUERY:
+            package = _QUERY_TMPL % self._sn_bytes
         elif cmd == CMD_INFO:
+            package = _INFO_TMPL % self._sn_bytes
+        elif cmd == CMD_SET:
             message = {
                 "pv": 0,
                 "cmd": cmd,
                 "sn": self._sn,
-                "msg": {},
+                "msg": {"attr": [int(key) for key in payload], "data": payload},
             }
+            package = _json_dumps(message) + b"\r\n"
         else:
             raise ValueError(f"Invalid CMD: {cmd}")
 
-        payload_str = json.dumps(message, separators=(",", ":"))
-        _LOGGER.debug(f"Sending: {payload_str}")
-        return bytes(payload_str + "\r\n", encoding="utf-8")
+        _LOGGER.debug("Sending: %s", package)
+        return package
 
     async def _async_send_receive(
         self, cmd: int, payload: Dict[str, Any], retries: int = 3
@@ -216,23 +270,44 @@ class CozyLifeDevice:
                         response_data = await asyncio.wait_for(
                             self._reader.readuntil(b"\r\n"), timeout=5.0
                         )
-                        response = json.loads(response_data.decode("utf-8").strip())
-
-                        # Verify SN matches
-                        if response.get("sn") == self._sn:
-                            return response
                     except asyncio.TimeoutError:
                         if attempt < retries - 1:
-                            _LOGGER.debug(f"Timeout on attempt {attempt + 1}, retrying...")
+                            _LOGGER.debug("Timeout on attempt %s, retrying...", attempt + 1)
                             continue
                         break
+                    except asyncio.LimitOverrunError as e:
+                        # Oversized frame: drop what has been buffered and keep reading
+                        _LOGGER.debug("Discarding %s bytes of oversized response", e.consumed)
+                        await self._reader.readexactly(e.consumed)
+                        continue
+
+                    frame = response_data.rstrip(b"\r\n")
+                    if not frame or self._sn_bytes not in frame:
+                        # Leftover terminator of a discarded frame, or a stale
+                        # reply to an earlier command: not worth parsing
+                        continue
+                    try:
+                        # Both parsers take bytes, so skip the utf-8 decode
+                        response = _json_loads(frame)
+                    except ValueError as e:
+                        # A garbled frame is not a dead connection; read the next one
+                        _LOGGER.debug("Ignoring malformed response: %s", e)
+                        continue
+
+                    # Verify SN matches
+                    if response.get("sn") == self._sn:
+                        return response
 
                 _LOGGER.warning("No valid response received")
                 return {}
 
+            except (ConnectionError, OSError, asyncio.IncompleteReadError) as e:
+                # Only socket-level failures mean the connection is gone
+                _LOGGER.error(f"Connection error in send_receive: {e}")
+                await self.async_disconnect()
+                return {}
             except Exception as e:
                 _LOGGER.error(f"Error in send_receive: {e}")
-                await self.async_disconnect()
                 return {}
 
     async def async_send_only(self, cmd: int, payload: Dict[str, Any]) -> None:
@@ -245,9 +320,11 @@ class CozyLifeDevice:
             package = self._get_package(cmd, payload)
             self._writer.write(package)
             await self._writer.drain()
+        except (ConnectionError, OSError) as e:
+            _LOGGER.error(f"Connection error sending command: {e}")
+            await self.async_disconnect()
         except Exception as e:
             _LOGGER.error(f"Error sending command: {e}")
-            await self.async_disconnect()
 
     async def async_query(self) -> Dict[str, Any]:
         """Query the device state."""
@@ -264,23 +341,3 @@ class CozyLifeDevice:
         except Exception as e:
             _LOGGER.error(f"Error controlling device: {e}")
             return False
-
-    # Backward compatibility wrappers for sync code
-    def query(self) -> dict:
-        """Synchronous query for backward compatibility."""
-        _LOGGER.warning(
-            "Using sync query() is deprecated, use async_query() instead"
-        )
-        # This won't work properly in async context, but provides fallback
-        return {}
-
-    def control(self, payload: dict) -> bool:
-        """Synchronous control for backward compatibility."""
-        _LOGGER.warning(
-            "Using sync control() is deprecated, use async_control() instead"
-        )
-        return False
-
-
-# Backward compatibility alias
-tcp_client = CozyLifeDevice
\ No newline at end of file
@@ -22,7 +22,6 @@ def get_ip() -> list:
     # Set a timeout so the socket does not block
     # indefinitely when trying to receive data.
     server.settimeout(0.1)
-    socket.setdefaulttimeout(0.1)
     message = '{"cmd":0,"pv":0,"sn":"' + get_sn() + '","msg":{}}'
     
     i = 0
@@ -33,7 +32,7 @@ def get_ip() -> list:
         i += 1
     
     i = 255
-    ip = []
+    ips = set()
     while i > 0:
         try:
             data, addr = server.recvfrom(1024)
@@ -41,10 +40,10 @@ def get_ip() -> list:
             _LOGGER.info('udp timeout')
             break
         _LOGGER.info(f'udp.receiver:{addr[0]}')
-        if addr[0] not in ip: ip.append(addr[0])
+        ips.add(addr[0])
         i -= 1
     
-    return ip
+    return list(ips)
 
 ip_list = get_ip()
 print(ip_list)
@@ -1,21 +1,72 @@
-import socket
-import time
 import ipaddress
 import asyncio
+import socket
 from .utils import get_sn
 import logging
 
 
 _LOGGER = logging.getLogger(__name__)
 
+# Maximum number of probe connections open at once during a subnet scan
+MAX_CONCURRENT_PROBES = 64
+# UDP port devices listen on for discovery broadcasts
+DISCOVERY_PORT = 6095
+# Discovery packets per broadcast, so a single lost datagram doesn't hide a device
+DISCOVERY_REPEAT = 3
+
 """
 discover device
 """
 
 
+class _DiscoveryProtocol(asyncio.DatagramProtocol):
+    """Collect the source addresses of discovery replies."""
+
+    def __init__(self) -> None:
+        self.ips: set = set()
+
+    def datagram_received(self, data: bytes, addr: tuple) -> None:
+        self.ips.add(addr[0])
+
+    def error_received(self, exc: Exception) -> None:
+        _LOGGER.debug(f"UDP discovery error: {exc}")
+
+
+async def _broadcast_discover(
+    address: str, timeout: float, repeat: int = DISCOVERY_REPEAT
+) -> list:
+    """
+    Send discovery packets to a broadcast address and collect replies.
+
+    Args:
+        address: Broadcast address to send to
+        timeout: How long to collect replies, in seconds
+        repeat: Number of packets to send, 30 ms apart
+
+    Returns:
+        List of IP addresses that replied
+    """
+    loop = asyncio.get_running_loop()
+    transport, protocol = await loop.create_datagram_endpoint(
+        _DiscoveryProtocol, local_addr=("0.0.0.0", 0), allow_broadcast=True
+    )
+    try:
+        message = '{"cmd":0,"pv":0,"sn":"' + get_sn() + '","msg":{}}'
+        for _ in range(repeat):
+            transport.sendto(bytes(message, encoding="utf-8"), (address, DISCOVERY_PORT))
+            await asyncio.sleep(0.03)
+        await asyncio.sleep(timeout)
+    finally:
+        transport.close()
+    return list(protocol.ips)
+
+
 async def scan_subnet_async(subnet: str, timeout: float = 1.0) -> list:
     """
-    Scan a subnet for CozyLife devices by attempting TCP connection.
+    Scan a subnet for CozyLife devices.
+
+    A directed UDP broadcast is tried first; if routers drop it and nothing
+    replies, every host is probed with a TCP connection instead.
 
     Args:
         subnet: CIDR notation subnet (e.g., '192.168.2.0/24')
@@ -31,15 +82,33 @@ async def scan_subnet_async(subnet: str, timeout: float = 1.0) -> list:
         network = ipaddress.ip_network(subnet, strict=False)
         _LOGGER.info(f"Scanning subnet {subnet} ({network.num_addresses} hosts)")
 
-        # Create tasks for all IPs in the subnet
-        tasks = []
-        for ip in network.hosts():  # Skip network and broadcast addresses
-            tasks.append(_check_device_at_ip(str(ip), timeout))
+        try:
+            replies = await _broadcast_discover(str(network.broadcast_address), timeout)
+        except OSError as e:
+            _LOGGER.debug(f"Broadcast to subnet {subnet} failed: {e}")
+            replies = []
+        found_ips = [ip for ip in replies if ipaddress.ip_address(ip) in network]
+        if found_ips:
+            _LOGGER.info(f"Found CozyLife devices via broadcast: {found_ips}")
+            return found_ips
+
+        _LOGGER.debug(f"No broadcast replies from {subnet}, probing hosts via TCP")
+
+        # Skip network and broadcast addresses
+        hosts = [str(ip) for ip in network.hosts()]
+
+        # Run checks concurrently, bounded to avoid exhausting sockets
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_PROBES)
 
-        # Run all checks concurrently
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        async def _bounded_check(ip: str) -> bool:
+            async with semaphore:
+                return await _check_device_at_ip(ip, timeout)
 
-        for ip, found in zip([str(ip) for ip in network.hosts()], results):
+        results = await asyncio.gather(
+            *(_bounded_check(ip) for ip in hosts), return_exceptions=True
+        )
+
+        for ip, found in zip(hosts, results):
             if found is True:
                 found_ips.append(ip)
                 _LOGGER.info(f"Found CozyLife device at {ip}")
@@ -63,72 +132,39 @@ async def _check_device_at_ip(ip: str, timeout: float = 1.0) -> bool:
     Returns:
         True if device found, False otherwise
     """
+    try:
+        version = ipaddress.ip_address(ip).version
+    except ValueError:
+        return False
+
+    # A bare socket is enough to test the port; no stream reader/writer needed
+    family = socket.AF_INET6 if version == 6 else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setblocking(False)
     try:
         # Try to connect to TCP port 5555 (CozyLife device port)
-        reader, writer = await asyncio.wait_for(
-            asyncio.open_connection(ip, 5555),
+        await asyncio.wait_for(
+            asyncio.get_running_loop().sock_connect(sock, (ip, 5555)),
             timeout=timeout
         )
-        writer.close()
-        await writer.wait_closed()
         return True
     except (asyncio.TimeoutError, ConnectionRefusedError, OSError):
         return False
     except Exception:
         return False
+    finally:
+        sock.close()
 
 
-def get_ip() -> list:
+async def get_ip(timeout: float = 1.0) -> list:
     """
-    get device ip
+    get device ip via UDP broadcast without blocking the event loop
+    :param timeout: seconds to collect replies
     :return: list
     """
-    server = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_UDP)
-    
-    server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-    # server.bind(('192.168.123.1', 0))
-    # Enable broadcasting mode
-    server.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
-    
-    # Set a timeout so the socket does not block
-    # indefinitely when trying to receive data.
-    server.settimeout(0.1)
-    socket.setdefaulttimeout(0.1)
-    message = '{"cmd":0,"pv":0,"sn":"' + get_sn() + '","msg":{}}'
-    
-    i = 0
-    while i < 3:
-        # server.sendto(bytes(message, encoding='utf-8'), ('<broadcast>', 6095))
-        server.sendto(bytes(message, encoding='utf-8'), ('255.255.255.255', 6095))
-        time.sleep(0.03)
-        i += 1
-
-    # max tries before first data received
-    max = 5
-    i = 0
-    while i < max:
-        i += 1
-        try:
-            data, addr = server.recvfrom(1024, socket.MSG_PEEK)
-        except Exception as err:
-            _LOGGER.info(f'{i}/{max} try, udp timeout')
-            continue
-        _LOGGER.info(f'first udp.receiver:{addr[0]}')
-        break
-    else:
+    ips = await _broadcast_discover("255.255.255.255", timeout)
+    if not ips:
         _LOGGER.warning('cannot find any device')
-        return []
-    
-    i = 255
-    ip = []
-    while i > 0:
-        try:
-            data, addr = server.recvfrom(1024)
-        except:
-            _LOGGER.info('udp timeout')
-            break
-        _LOGGER.info(f'udp.receiver:{addr[0]}')
-        if addr[0] not in ip: ip.append(addr[0])
-        i -= 1
-    
-    return ip
+    for ip in ips:
+        _LOGGER.info(f'udp.receiver:{ip}')
+    return ips
@@ -1,4 +1,6 @@
 # -*- coding: utf-8 -*-
+import asyncio
+import itertools
 import json
 import time
 import requests
@@ -9,17 +11,36 @@ from .const import (
 )
 _LOGGER = logging.getLogger(__name__)
 
+# orjson ships with Home Assistant; fall back to json when run standalone
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+
+# sn values count up from the startup time in ms: same shape as a
+# timestamp, but unique even for messages sent within the same ms
+_SN_COUNTER = itertools.count(int(round(time.time() * 1000)))
+
 
 def get_sn() -> str:
     """
     message sn
     :return: str
     """
-    return str(int(round(time.time() * 1000)))
+    return str(next(_SN_COUNTER))
 
 
 # cache get_pid_list result for many calls
 _CACHE_PID = []
+# pid -> (icon, model name, dpid list, type code), built alongside _CACHE_PID
+_CACHE_PID_INDEX = {}
+# serializes the first load so concurrent devices don't all fetch the list
+_CACHE_PID_LOCK = asyncio.Lock()
+# after a failed fetch, don't hit the network again before this monotonic time
+_CACHE_PID_RETRY_AT = 0.0
+PID_LIST_RETRY_DELAY = 60
 
 
 def get_pid_list(lang='en') -> list:
@@ -28,7 +49,7 @@ def get_pid_list(lang='en') -> list:
     :param lang:
     :return:
     """
-    global _CACHE_PID
+    global _CACHE_PID, _CACHE_PID_INDEX
     if len(_CACHE_PID) != 0:
         return _CACHE_PID
     
@@ -44,7 +65,7 @@ def get_pid_list(lang='en') -> list:
         _LOGGER.info('get_pid_list.result is none')
         return []
     try:
-        pid_list = json.loads(res.content)
+        pid_list = _json_loads(res.content)
     except:
         _LOGGER.info('get_pid_list.result is not json')
         return []
@@ -61,5 +82,60 @@ def get_pid_list(lang='en') -> list:
     if pid_list['info'].get('list') is None or type(pid_list['info']['list']) is not list:
         return []
     
-    _CACHE_PID = pid_list['info']['list']    
+    _CACHE_PID = pid_list['info']['list']
+    _CACHE_PID_INDEX = _build_pid_index(_CACHE_PID)
+    return _CACHE_PID
+
+
+def _build_pid_index(pid_list: list) -> dict:
+    """
+    flatten the category/model tree into pid -> (icon, name, dpid, type code)
+    :param pid_list:
+    :return:
+    """
+    index = {}
+    for item in pid_list:
+        for model in item.get('m') or []:
+            pid = model.get('pid')
+            if pid and pid not in index:
+                index[pid] = (
+                    model.get('i', ''),
+                    model.get('n', ''),
+                    model.get('dpid', []),
+                    item.get('c', ''),
+                )
+    return index
+
+
+async def async_get_pid_list(lang=LANG) -> list:
+    """
+    get_pid_list without blocking the event loop; only the first call
+    hits the network (in an executor), later calls return the cache.
+    A failed fetch is not retried for PID_LIST_RETRY_DELAY seconds, so
+    devices connecting meanwhile don't each wait out the HTTP timeout
+    :param lang:
+    :return:
+    """
+    global _CACHE_PID_RETRY_AT
+    if len(_CACHE_PID) != 0 or time.monotonic() < _CACHE_PID_RETRY_AT:
+        return _CACHE_PID
+
+    async with _CACHE_PID_LOCK:
+        if len(_CACHE_PID) == 0 and time.monotonic() >= _CACHE_PID_RETRY_AT:
+            try:
+                await asyncio.get_running_loop().run_in_executor(None, get_pid_list, lang)
+            finally:
+                if len(_CACHE_PID) == 0:
+                    _CACHE_PID_RETRY_AT = time.monotonic() + PID_LIST_RETRY_DELAY
     return _CACHE_PID
+
+
+async def async_get_pid_info(pid: str, lang=LANG):
+    """
+    look up product info for a pid
+    :param pid:
+    :param lang:
+    :return: (icon, model name, dpid list, type code) or None
+    """
+    await async_get_pid_list(lang)
+    return _CACHE_PID_INDEX.get(pid)